@@ -17,8 +17,12 @@
 Helper utilities related to the AWS API implementations
 '''
 
-import re
+import collections
 import itertools
+import re
+
+from lxml import etree
+
 from heat.api.aws import exception
 
 from heat.openstack.common import log as logging
@@ -29,10 +33,119 @@ LOG = logging.getLogger(__name__)
 def format_response(action, response):
     """
     Format response from engine into API format
+
+    If the response is a dict whose only item is an iterator (such as a
+    generator), the items are not materialized here; the result is a
+    StreamingResponse, as returned by format_response_streaming.
     """
+    if isinstance(response, dict) and len(response) == 1:
+        key, value = response.items()[0]
+        if isinstance(value, collections.Iterator):
+            return format_response_streaming(action, value, key)
     return {'%sResponse' % action: {'%sResult' % action: response}}
 
 
+def format_response_streaming(action, iter_items, key):
+    """
+    Format a response from engine containing a single list of items into
+    API format, deferring serialization of the items
+
+    The items may be any iterable (typically a generator which formats
+    each engine result); apart from the first, they are only consumed when
+    the response is serialized, in chunks, by the WSGI resource.
+    """
+    return StreamingResponse(action, iter_items, key)
+
+
+class StreamingResponse(object):
+    """
+    An API response whose list member is serialized incrementally
+
+    Serialized output is buffered and emitted in chunks of (at least)
+    CHUNK_SIZE bytes, suitable for use as a webob.Response app_iter.
+
+    The first item is consumed on creation, so that an error producing it
+    is raised while the controller is still handling the request and can
+    be returned as an error response. Errors producing later items can
+    only occur once the response status has been sent; they are logged
+    and re-raised, so that the response is aborted rather than completed.
+    """
+
+    CHUNK_SIZE = 16384
+
+    def __init__(self, action, iter_items, key):
+        self.action = action
+        self.key = key
+
+        iter_items = iter(iter_items)
+        try:
+            first = next(iter_items)
+        except StopIteration:
+            self.items = iter_items
+        else:
+            self.items = itertools.chain((first,), iter_items)
+
+    def to_dict(self):
+        """
+        Return the response as a plain dict, consuming the items
+        """
+        return format_response(self.action, {self.key: list(self.items)})
+
+    def _chunks(self, pieces):
+        buf = []
+        buf_len = 0
+        try:
+            for piece in pieces:
+                buf.append(piece)
+                buf_len += len(piece)
+                if buf_len >= self.CHUNK_SIZE:
+                    yield ''.join(buf)
+                    buf = []
+                    buf_len = 0
+        except Exception:
+            LOG.exception("Error serializing %sResponse, aborting "
+                          "response" % self.action)
+            raise
+        if buf:
+            yield ''.join(buf)
+
+    def to_xml(self, serializer):
+        """
+        Return an iterator of XML chunks, serializing each item with the
+        object_to_element method of the given XML serializer
+        """
+        tags = ('%sResponse' % self.action, '%sResult' % self.action,
+                self.key)
+
+        def pieces():
+            yield ''.join('<%s>' % t for t in tags)
+            for item in self.items:
+                member = etree.Element('member')
+                serializer.object_to_element(item, member)
+                yield etree.tostring(member)
+            yield ''.join('</%s>' % t for t in reversed(tags))
+
+        return self._chunks(pieces())
+
+    def to_json(self, serializer):
+        """
+        Return an iterator of JSON chunks, serializing each item with the
+        dumps method of the given JSON serializer (which, unlike to_json,
+        does not log each item)
+        """
+        def pieces():
+            yield '{"%sResponse": {"%sResult": {"%s": [' % (self.action,
+                                                            self.action,
+                                                            self.key)
+            for i, item in enumerate(self.items):
+                if i:
+                    yield ', '
+                yield serializer.dumps(item)
+            yield ']}}}'
+
+        return self._chunks(pieces())
+
+
 def extract_param_pairs(params, prefix='', keyname='', valuename=''):
     """
     Extract a dictionary of user input parameters, from AWS style
@@ -110,6 +223,11 @@ def get_param_value(params, key):
 def reformat_dict_keys(keymap={}, inputdict={}):
     '''
     Utility function for mapping one dict format to another
+
+    The keymap may be either a dict or a sequence of (inkey, outkey) pairs;
+    the latter allows callers to define their keymaps once, at module level.
     '''
-    return dict([(outk, inputdict[ink]) for ink, outk in keymap.items()
-                if ink in inputdict])
+    if isinstance(keymap, dict):
+        keymap = keymap.items()
+    return dict([(outk, inputdict[ink]) for ink, outk in keymap
+                 if ink in inputdict])
@@ -17,11 +17,15 @@
 Stack endpoint for Heat CloudFormation v1 API.
 """
 
+import functools
 import json
+import os
 import socket
+import time
 
 from heat.api.aws import exception
 from heat.api.aws import utils as api_utils
+from heat.api.middleware import compression
 from heat.common import wsgi
 from heat.common import exception as heat_exception
 from heat.rpc import client as rpc_client
@@ -32,11 +36,159 @@ from heat.common import urlfetch
 from heat.common import policy
 
 from heat.openstack.common import log as logging
+from heat.openstack.common.rpc import common as rpc_common
 from heat.openstack.common.gettextutils import _
 
 logger = logging.getLogger(__name__)
 
 
+def _is_unsupported_version(ex):
+    """
+    Return whether an exception from an RPC call indicates that the engine
+    does not support the requested RPC API version.
+    """
+    return (isinstance(ex, rpc_common.UnsupportedRpcVersion) or
+            getattr(ex, 'exc_type', None) == 'UnsupportedRpcVersion')
+
+
+def _ttl_cache(maxsize, ttl):
+    """
+    Decorator caching the result of a single-argument function for ttl
+    seconds, holding at most maxsize results.
+
+    Exceptions are not cached. When the cache is full, expired results are
+    discarded first and then the oldest results.
+    """
+    def decorator(func):
+        cache = {}
+
+        @functools.wraps(func)
+        def wrapper(key):
+            now = time.time()
+            if key in cache:
+                expiry, value = cache[key]
+                if now < expiry:
+                    return value
+                del cache[key]
+
+            value = func(key)
+
+            if len(cache) >= maxsize:
+                for k, (expiry, v) in cache.items():
+                    if expiry <= now:
+                        del cache[k]
+                # All results have the same ttl, so the earliest expiry is
+                # also the oldest result
+                while len(cache) >= maxsize:
+                    del cache[min(cache, key=lambda c: cache[c][0])]
+            cache[key] = (now + ttl, value)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+@_ttl_cache(maxsize=64, ttl=30)
+def _fetch_template(url):
+    """
+    Fetch a template from a URL, reusing the result for repeated requests
+    for the same URL in a short time (e.g. ValidateTemplate then CreateStack).
+    """
+    return urlfetch.get(url)
+
+
+# Map the engine-api format to the AWS StackSummary datatype
+_STACK_SUMMARY_KEYMAP = (
+    (engine_api.STACK_CREATION_TIME, 'CreationTime'),
+    (engine_api.STACK_UPDATED_TIME, 'LastUpdatedTime'),
+    (engine_api.STACK_ID, 'StackId'),
+    (engine_api.STACK_NAME, 'StackName'),
+    (engine_api.STACK_STATUS_DATA, 'StackStatusReason'),
+    (engine_api.STACK_TMPL_DESCRIPTION, 'TemplateDescription'),
+)
+
+# Map the engine-api format to the AWS Stack datatype
+_STACK_KEYMAP = (
+    (engine_api.STACK_CAPABILITIES, 'Capabilities'),
+    (engine_api.STACK_CREATION_TIME, 'CreationTime'),
+    (engine_api.STACK_DESCRIPTION, 'Description'),
+    (engine_api.STACK_DISABLE_ROLLBACK, 'DisableRollback'),
+    (engine_api.STACK_UPDATED_TIME, 'LastUpdatedTime'),
+    (engine_api.STACK_NOTIFICATION_TOPICS, 'NotificationARNs'),
+    (engine_api.STACK_PARAMETERS, 'Parameters'),
+    (engine_api.STACK_ID, 'StackId'),
+    (engine_api.STACK_NAME, 'StackName'),
+    (engine_api.STACK_STATUS_DATA, 'StackStatusReason'),
+    (engine_api.STACK_TIMEOUT, 'TimeoutInMinutes'),
+)
+
+# Map the engine-api format to the AWS Output datatype
+_OUTPUT_KEYMAP = (
+    (engine_api.OUTPUT_DESCRIPTION, 'Description'),
+    (engine_api.OUTPUT_KEY, 'OutputKey'),
+    (engine_api.OUTPUT_VALUE, 'OutputValue'),
+)
+
+# Map the engine-api format to the AWS StackEvent datatype
+_STACK_EVENT_KEYMAP = (
+    (engine_api.EVENT_ID, 'EventId'),
+    (engine_api.EVENT_RES_NAME, 'LogicalResourceId'),
+    (engine_api.EVENT_RES_PHYSICAL_ID, 'PhysicalResourceId'),
+    (engine_api.EVENT_RES_PROPERTIES, 'ResourceProperties'),
+    (engine_api.EVENT_RES_STATUS_DATA, 'ResourceStatusReason'),
+    (engine_api.EVENT_RES_TYPE, 'ResourceType'),
+    (engine_api.EVENT_STACK_ID, 'StackId'),
+    (engine_api.EVENT_STACK_NAME, 'StackName'),
+    (engine_api.EVENT_TIMESTAMP, 'Timestamp'),
+)
+
+# Map the engine-api format to the AWS StackResourceDetail datatype
+_RESOURCE_DETAIL_KEYMAP = (
+    (engine_api.RES_DESCRIPTION, 'Description'),
+    (engine_api.RES_UPDATED_TIME, 'LastUpdatedTimestamp'),
+    (engine_api.RES_NAME, 'LogicalResourceId'),
+    (engine_api.RES_METADATA, 'Metadata'),
+    (engine_api.RES_PHYSICAL_ID, 'PhysicalResourceId'),
+    (engine_api.RES_STATUS_DATA, 'ResourceStatusReason'),
+    (engine_api.RES_TYPE, 'ResourceType'),
+    (engine_api.RES_STACK_ID, 'StackId'),
+    (engine_api.RES_STACK_NAME, 'StackName'),
+)
+
+# Map the engine-api format to the AWS StackResource datatype
+_STACK_RESOURCE_KEYMAP = (
+    (engine_api.RES_DESCRIPTION, 'Description'),
+    (engine_api.RES_NAME, 'LogicalResourceId'),
+    (engine_api.RES_PHYSICAL_ID, 'PhysicalResourceId'),
+    (engine_api.RES_STATUS_DATA, 'ResourceStatusReason'),
+    (engine_api.RES_TYPE, 'ResourceType'),
+    (engine_api.RES_STACK_ID, 'StackId'),
+    (engine_api.RES_STACK_NAME, 'StackName'),
+    (engine_api.RES_UPDATED_TIME, 'Timestamp'),
+)
+
+# Map the engine-api format to the AWS StackResourceSummary datatype
+_RESOURCE_SUMMARY_KEYMAP = (
+    (engine_api.RES_UPDATED_TIME, 'LastUpdatedTimestamp'),
+    (engine_api.RES_NAME, 'LogicalResourceId'),
+    (engine_api.RES_PHYSICAL_ID, 'PhysicalResourceId'),
+    (engine_api.RES_STATUS_DATA, 'ResourceStatusReason'),
+    (engine_api.RES_TYPE, 'ResourceType'),
+)
+
+# Engine keys read for every item by the formatters below, bound once here
+# rather than looked up on engine_api for each item
+_STACK_ACTION = engine_api.STACK_ACTION
+_STACK_STATUS = engine_api.STACK_STATUS
+_STACK_DELETION_TIME = engine_api.STACK_DELETION_TIME
+_STACK_OUTPUTS = engine_api.STACK_OUTPUTS
+_EVENT_RES_ACTION = engine_api.EVENT_RES_ACTION
+_EVENT_RES_STATUS = engine_api.EVENT_RES_STATUS
+_RES_ACTION = engine_api.RES_ACTION
+_RES_STATUS = engine_api.RES_STATUS
+
+
 class StackController(object):
 
     """
@@ -44,35 +196,98 @@ class StackController(object):
     Implements the API actions
     """
 
+    # Minimum interval, in seconds, between checks of the policy file for
+    # modifications which invalidate the cached policy decisions
+    POLICY_CHECK_INTERVAL = 1
+
+    # Maximum number of cached policy decisions; the cache is emptied when it
+    # is full, so that it does not grow with every distinct requester
+    POLICY_CACHE_SIZE = 1024
+
+    # Interval, in seconds, for which an engine that rejected RPC API version
+    # 1.1 is assumed to be unable to resolve stack names, before trying again
+    # (e.g. once the engine has been upgraded)
+    ENGINE_VERSION_CHECK_INTERVAL = 300
+
     def __init__(self, options):
         self.options = options
         self.engine_rpcapi = rpc_client.EngineClient()
         self.policy = policy.Enforcer(scope='cloudformation')
+        self._policy_cache = {}
+        self._policy_mtime = None
+        self._policy_checked = 0
+        self._old_engine_until = 0
 
-    def _enforce(self, req, action):
-        """Authorize an action against the policy.json."""
+    def _check_policy_cache(self):
+        """
+        Clear the cached policy decisions if the policy file has changed.
+        """
+        now = time.time()
+        if now - self._policy_checked < self.POLICY_CHECK_INTERVAL:
+            return
+        self._policy_checked = now
+
+        path = self.policy.enforcer.policy_path
         try:
-            self.policy.enforce(req.context, action, {})
-        except heat_exception.Forbidden:
+            mtime = path and os.stat(path).st_mtime
+        except OSError:
+            mtime = None
+        if mtime != self._policy_mtime:
+            self._policy_cache.clear()
+            self._policy_mtime = mtime
+
+    def _enforce(self, req, action):
+        """
+        Authorize an action against the policy.json.
+
+        Actions are checked without a target, so the decision depends only
+        on the action and the requester's credentials, and can be cached.
+        """
+        self._check_policy_cache()
+        con = req.context
+        key = (action, tuple(sorted(con.roles or [])),
+               con.username, con.tenant)
+        allowed = self._policy_cache.get(key)
+        if allowed is None:
+            try:
+                self.policy.enforce(con, action, {})
+                allowed = True
+            except heat_exception.Forbidden:
+                allowed = False
+            except Exception:
+                # We expect policy.enforce to either pass or raise Forbidden
+                # however, if anything else happens, we want to raise
+                # HeatInternalFailureError, failure to do this results in
+                # the user getting a big stacktrace spew as an API response
+                raise exception.HeatInternalFailureError(
+                    "Error authorizing action %s" % action)
+            if len(self._policy_cache) >= self.POLICY_CACHE_SIZE:
+                self._policy_cache.clear()
+            self._policy_cache[key] = allowed
+        if not allowed:
             raise exception.HeatAccessDeniedError("Action %s not allowed " %
                                                   action + "for user")
-        except Exception as ex:
-            # We expect policy.enforce to either pass or raise Forbidden
-            # however, if anything else happens, we want to raise
-            # HeatInternalFailureError, failure to do this results in
-            # the user getting a big stacktrace spew as an API response
-            raise exception.HeatInternalFailureError("Error authorizing " +
-                                                     "action %s" % action)
 
     @staticmethod
-    def _id_format(resp):
+    def _id_format(resp, arn_cache=None):
         """
         Format the StackId field in the response as an ARN, and process other
         IDs into the correct format.
+
+        If an arn_cache dict is passed, ARNs are looked up in (and added to)
+        it, so that a list of items belonging to the same stack need only
+        generate the ARN once.
         """
         if 'StackId' in resp:
-            identity = identifier.HeatIdentifier(**resp['StackId'])
-            resp['StackId'] = identity.arn()
+            if arn_cache is None:
+                identity = identifier.HeatIdentifier(**resp['StackId'])
+                resp['StackId'] = identity.arn()
+            else:
+                key = tuple(sorted(resp['StackId'].items()))
+                if key not in arn_cache:
+                    identity = identifier.HeatIdentifier(**resp['StackId'])
+                    arn_cache[key] = identity.arn()
+                resp['StackId'] = arn_cache[key]
         if 'EventId' in resp:
             identity = identifier.EventIdentifier(**resp['EventId'])
             resp['EventId'] = identity.event_id
@@ -94,6 +309,22 @@ class StackController(object):
                                              keyname='ParameterKey',
                                              valuename='ParameterValue')
 
+    @staticmethod
+    def _identity_from_arn(stack_name):
+        """
+        Return the stack identifier for the given stack name if it is an ARN,
+        or else None.
+        """
+        # Most requests use a plain stack name, so avoid raising and catching
+        # a ValueError from the ARN parser unless it could possibly succeed
+        if not (isinstance(stack_name, basestring) and
+                stack_name[:4].lower() == 'arn:'):
+            return None
+        try:
+            return dict(identifier.HeatIdentifier.from_arn(stack_name))
+        except ValueError:
+            return None
+
     def _get_identity(self, con, stack_name):
         """
         Generate a stack identifier from the given stack name or ARN.
@@ -101,10 +332,39 @@ class StackController(object):
         In the case of a stack name, the identifier will be looked up in the
         engine over RPC.
         """
-        try:
-            return dict(identifier.HeatIdentifier.from_arn(stack_name))
-        except ValueError:
-            return self.engine_rpcapi.identify_stack(con, stack_name)
+        identity = self._identity_from_arn(stack_name)
+        if identity is None:
+            identity = self.engine_rpcapi.identify_stack(con, stack_name)
+        return identity
+
+    def _call_for_stack(self, req, stack_name, rpc_method, **kwargs):
+        """
+        Call an engine RPC method taking a stack_identity argument, for the
+        stack with the given name or ARN.
+
+        Where the stack identifier is not already known, the stack name is
+        passed to the engine to be resolved as part of the same call, saving
+        a separate identify_stack round trip. Engines which predate RPC API
+        version 1.1 do not support this, in which case the identifier is
+        looked up first. Once an engine has rejected version 1.1, the
+        identifier is looked up first for ENGINE_VERSION_CHECK_INTERVAL
+        seconds, rather than repeating the rejected call for every request.
+        """
+        identity = self._identity_from_arn(stack_name)
+        if identity is None and time.time() >= self._old_engine_until:
+            try:
+                return rpc_method(req.context, stack_identity=stack_name,
+                                  **kwargs)
+            except Exception as ex:
+                if not _is_unsupported_version(ex):
+                    raise
+                logger.info(_('Engine does not support RPC API version 1.1, '
+                              'looking up stack identifiers separately'))
+                self._old_engine_until = (time.time() +
+                                          self.ENGINE_VERSION_CHECK_INTERVAL)
+        if identity is None:
+            identity = self._get_identity(req.context, stack_name)
+        return rpc_method(req.context, stack_identity=identity, **kwargs)
 
     def list(self, req):
         """
@@ -113,33 +373,26 @@ class StackController(object):
         """
         self._enforce(req, 'ListStacks')
 
+        reformat = api_utils.reformat_dict_keys
+        id_format = self._id_format
+
         def format_stack_summary(s):
             """
             Reformat engine output into the AWS "StackSummary" format
             """
-            # Map the engine-api format to the AWS StackSummary datatype
-            keymap = {
-                engine_api.STACK_CREATION_TIME: 'CreationTime',
-                engine_api.STACK_UPDATED_TIME: 'LastUpdatedTime',
-                engine_api.STACK_ID: 'StackId',
-                engine_api.STACK_NAME: 'StackName',
-                engine_api.STACK_STATUS_DATA: 'StackStatusReason',
-                engine_api.STACK_TMPL_DESCRIPTION: 'TemplateDescription',
-            }
+            result = reformat(_STACK_SUMMARY_KEYMAP, s)
 
-            result = api_utils.reformat_dict_keys(keymap, s)
-
-            action = s[engine_api.STACK_ACTION]
-            status = s[engine_api.STACK_STATUS]
+            action = s[_STACK_ACTION]
+            status = s[_STACK_STATUS]
             result['StackStatus'] = '_'.join((action, status))
 
             # AWS docs indicate DeletionTime is ommitted for current stacks
             # This is still TODO(unknown) in the engine, we don't keep data for
             # stacks after they are deleted
-            if engine_api.STACK_DELETION_TIME in s:
-                result['DeletionTime'] = s[engine_api.STACK_DELETION_TIME]
+            if _STACK_DELETION_TIME in s:
+                result['DeletionTime'] = s[_STACK_DELETION_TIME]
 
-            return self._id_format(result)
+            return id_format(result)
 
         con = req.context
         try:
@@ -147,7 +400,7 @@ class StackController(object):
         except Exception as ex:
             return exception.map_remote_error(ex)
 
-        res = {'StackSummaries': [format_stack_summary(s) for s in stack_list]}
+        res = {'StackSummaries': (format_stack_summary(s) for s in stack_list)}
 
         return api_utils.format_response('ListStacks', res)
 
@@ -158,60 +411,37 @@ class StackController(object):
         """
         self._enforce(req, 'DescribeStacks')
 
-        def format_stack_outputs(o):
-            keymap = {
-                engine_api.OUTPUT_DESCRIPTION: 'Description',
-                engine_api.OUTPUT_KEY: 'OutputKey',
-                engine_api.OUTPUT_VALUE: 'OutputValue',
-            }
-
-            def replacecolon(d):
-                return dict(map(lambda (k, v): (k.replace(':', '.'), v),
-                                d.items()))
+        reformat = api_utils.reformat_dict_keys
+        id_format = self._id_format
 
+        def format_stack_outputs(o):
             def transform(attrs):
                 """
                 Recursively replace all : with . in dict keys
                 so that they are not interpreted as xml namespaces.
                 """
-                new = replacecolon(attrs)
-                for key, value in new.items():
-                    if isinstance(value, dict):
-                        new[key] = transform(value)
-                return new
+                return dict((k.replace(':', '.'),
+                             transform(v) if isinstance(v, dict) else v)
+                            for k, v in attrs.items())
 
-            return api_utils.reformat_dict_keys(keymap, transform(o))
+            return reformat(_OUTPUT_KEYMAP, transform(o))
 
         def format_stack(s):
             """
             Reformat engine output into the AWS "StackSummary" format
             """
-            keymap = {
-                engine_api.STACK_CAPABILITIES: 'Capabilities',
-                engine_api.STACK_CREATION_TIME: 'CreationTime',
-                engine_api.STACK_DESCRIPTION: 'Description',
-                engine_api.STACK_DISABLE_ROLLBACK: 'DisableRollback',
-                engine_api.STACK_UPDATED_TIME: 'LastUpdatedTime',
-                engine_api.STACK_NOTIFICATION_TOPICS: 'NotificationARNs',
-                engine_api.STACK_PARAMETERS: 'Parameters',
-                engine_api.STACK_ID: 'StackId',
-                engine_api.STACK_NAME: 'StackName',
-                engine_api.STACK_STATUS_DATA: 'StackStatusReason',
-                engine_api.STACK_TIMEOUT: 'TimeoutInMinutes',
-            }
-
-            result = api_utils.reformat_dict_keys(keymap, s)
+            result = reformat(_STACK_KEYMAP, s)
 
-            action = s[engine_api.STACK_ACTION]
-            status = s[engine_api.STACK_STATUS]
+            action = s[_STACK_ACTION]
+            status = s[_STACK_STATUS]
             result['StackStatus'] = '_'.join((action, status))
 
             # Reformat outputs, these are handled separately as they are
             # only present in the engine output for a completely created
             # stack
             result['Outputs'] = []
-            if engine_api.STACK_OUTPUTS in s:
-                for o in s[engine_api.STACK_OUTPUTS]:
+            if _STACK_OUTPUTS in s:
+                for o in s[_STACK_OUTPUTS]:
                     result['Outputs'].append(format_stack_outputs(o))
 
             # Reformat Parameters dict-of-dict into AWS API format
@@ -219,9 +449,10 @@ class StackController(object):
             # "ParameterValue" : value format.
             result['Parameters'] = [{'ParameterKey': k,
                                     'ParameterValue': v}
-                                    for (k, v) in result['Parameters'].items()]
+                                    for (k, v) in
+                                    result['Parameters'].iteritems()]
 
-            return self._id_format(result)
+            return id_format(result)
 
         con = req.context
         # If no StackName parameter is passed, we pass None into the engine
@@ -229,16 +460,16 @@ class StackController(object):
         # is the behavior described in the AWS DescribeStacks API docs
         try:
             if 'StackName' in req.params:
-                identity = self._get_identity(con, req.params['StackName'])
+                stack_list = self._call_for_stack(
+                    req, req.params['StackName'],
+                    self.engine_rpcapi.show_stack)
             else:
-                identity = None
-
-            stack_list = self.engine_rpcapi.show_stack(con, identity)
+                stack_list = self.engine_rpcapi.show_stack(con, None)
 
         except Exception as ex:
             return exception.map_remote_error(ex)
 
-        res = {'Stacks': [format_stack(s) for s in stack_list]}
+        res = {'Stacks': (format_stack(s) for s in stack_list)}
 
         return api_utils.format_response('DescribeStacks', res)
 
@@ -253,7 +484,7 @@ class StackController(object):
             url = req.params['TemplateUrl']
             logger.debug('TemplateUrl %s' % url)
             try:
-                return urlfetch.get(url)
+                return _fetch_template(url)
             except IOError as exc:
                 msg = _('Failed to fetch template: %s') % str(exc)
                 raise exception.HeatInvalidParameterValueError(detail=msg)
@@ -372,10 +603,9 @@ class StackController(object):
         """
         self._enforce(req, 'GetTemplate')
 
-        con = req.context
         try:
-            identity = self._get_identity(con, req.params['StackName'])
-            templ = self.engine_rpcapi.get_template(con, identity)
+            templ = self._call_for_stack(req, req.params['StackName'],
+                                         self.engine_rpcapi.get_template)
         except Exception as ex:
             return exception.map_remote_error(ex)
 
@@ -455,10 +685,10 @@ class StackController(object):
         """
         self._enforce(req, 'DeleteStack')
 
-        con = req.context
         try:
-            identity = self._get_identity(con, req.params['StackName'])
-            res = self.engine_rpcapi.delete_stack(con, identity, cast=False)
+            res = self._call_for_stack(req, req.params['StackName'],
+                                       self.engine_rpcapi.delete_stack,
+                                       cast=False)
 
         except Exception as ex:
             return exception.map_remote_error(ex)
@@ -475,48 +705,45 @@ class StackController(object):
         """
         self._enforce(req, 'DescribeStackEvents')
 
+        reformat = api_utils.reformat_dict_keys
+        id_format = self._id_format
+
         def format_stack_event(e):
             """
             Reformat engine output into the AWS "StackEvent" format
             """
-            keymap = {
-                engine_api.EVENT_ID: 'EventId',
-                engine_api.EVENT_RES_NAME: 'LogicalResourceId',
-                engine_api.EVENT_RES_PHYSICAL_ID: 'PhysicalResourceId',
-                engine_api.EVENT_RES_PROPERTIES: 'ResourceProperties',
-                engine_api.EVENT_RES_STATUS_DATA: 'ResourceStatusReason',
-                engine_api.EVENT_RES_TYPE: 'ResourceType',
-                engine_api.EVENT_STACK_ID: 'StackId',
-                engine_api.EVENT_STACK_NAME: 'StackName',
-                engine_api.EVENT_TIMESTAMP: 'Timestamp',
-            }
-
-            result = api_utils.reformat_dict_keys(keymap, e)
-            action = e[engine_api.EVENT_RES_ACTION]
-            status = e[engine_api.EVENT_RES_STATUS]
+            result = reformat(_STACK_EVENT_KEYMAP, e)
+            action = e[_EVENT_RES_ACTION]
+            status = e[_EVENT_RES_STATUS]
             result['ResourceStatus'] = '_'.join((action, status))
             result['ResourceProperties'] = json.dumps(result[
                                                       'ResourceProperties'])
 
-            return self._id_format(result)
+            return id_format(result, arn_cache)
 
         con = req.context
         stack_name = req.params.get('StackName', None)
         try:
-            identity = stack_name and self._get_identity(con, stack_name)
-            events = self.engine_rpcapi.list_events(con, identity)
+            if stack_name:
+                events = self._call_for_stack(req, stack_name,
+                                              self.engine_rpcapi.list_events)
+            else:
+                events = self.engine_rpcapi.list_events(con, None)
         except Exception as ex:
             return exception.map_remote_error(ex)
 
-        result = [format_stack_event(e) for e in events]
+        # Events generally all belong to the same stack, so only generate
+        # the ARN for each distinct StackId once
+        arn_cache = {}
+        result = (format_stack_event(e) for e in events)
 
         return api_utils.format_response('DescribeStackEvents',
                                          {'StackEvents': result})
 
     @staticmethod
     def _resource_status(res):
-        action = res[engine_api.RES_ACTION]
-        status = res[engine_api.RES_STATUS]
+        action = res[_RES_ACTION]
+        status = res[_RES_STATUS]
         return '_'.join((action, status))
 
     def describe_stack_resource(self, req):
@@ -530,31 +757,16 @@ class StackController(object):
             """
             Reformat engine output into the AWS "StackResourceDetail" format
             """
-            keymap = {
-                engine_api.RES_DESCRIPTION: 'Description',
-                engine_api.RES_UPDATED_TIME: 'LastUpdatedTimestamp',
-                engine_api.RES_NAME: 'LogicalResourceId',
-                engine_api.RES_METADATA: 'Metadata',
-                engine_api.RES_PHYSICAL_ID: 'PhysicalResourceId',
-                engine_api.RES_STATUS_DATA: 'ResourceStatusReason',
-                engine_api.RES_TYPE: 'ResourceType',
-                engine_api.RES_STACK_ID: 'StackId',
-                engine_api.RES_STACK_NAME: 'StackName',
-            }
-
-            result = api_utils.reformat_dict_keys(keymap, r)
+            result = api_utils.reformat_dict_keys(_RESOURCE_DETAIL_KEYMAP, r)
 
             result['ResourceStatus'] = self._resource_status(r)
 
             return self._id_format(result)
 
-        con = req.context
-
         try:
-            identity = self._get_identity(con, req.params['StackName'])
-            resource_details = self.engine_rpcapi.describe_stack_resource(
-                con,
-                stack_identity=identity,
+            resource_details = self._call_for_stack(
+                req, req.params['StackName'],
+                self.engine_rpcapi.describe_stack_resource,
                 resource_name=req.params.get('LogicalResourceId'))
 
         except Exception as ex:
@@ -583,26 +795,19 @@ class StackController(object):
         """
         self._enforce(req, 'DescribeStackResources')
 
+        reformat = api_utils.reformat_dict_keys
+        resource_status = self._resource_status
+        id_format = self._id_format
+
         def format_stack_resource(r):
             """
             Reformat engine output into the AWS "StackResource" format
             """
-            keymap = {
-                engine_api.RES_DESCRIPTION: 'Description',
-                engine_api.RES_NAME: 'LogicalResourceId',
-                engine_api.RES_PHYSICAL_ID: 'PhysicalResourceId',
-                engine_api.RES_STATUS_DATA: 'ResourceStatusReason',
-                engine_api.RES_TYPE: 'ResourceType',
-                engine_api.RES_STACK_ID: 'StackId',
-                engine_api.RES_STACK_NAME: 'StackName',
-                engine_api.RES_UPDATED_TIME: 'Timestamp',
-            }
+            result = reformat(_STACK_RESOURCE_KEYMAP, r)
 
-            result = api_utils.reformat_dict_keys(keymap, r)
+            result['ResourceStatus'] = resource_status(r)
 
-            result['ResourceStatus'] = self._resource_status(r)
-
-            return self._id_format(result)
+            return id_format(result, arn_cache)
 
         con = req.context
         stack_name = req.params.get('StackName')
@@ -613,20 +818,24 @@ class StackController(object):
 
         try:
             if stack_name is not None:
-                identity = self._get_identity(con, stack_name)
+                resources = self._call_for_stack(
+                    req, stack_name,
+                    self.engine_rpcapi.describe_stack_resources,
+                    resource_name=req.params.get('LogicalResourceId'))
             else:
                 identity = self.engine_rpcapi.find_physical_resource(
                     con,
                     physical_resource_id=physical_resource_id)
-            resources = self.engine_rpcapi.describe_stack_resources(
-                con,
-                stack_identity=identity,
-                resource_name=req.params.get('LogicalResourceId'))
+                resources = self.engine_rpcapi.describe_stack_resources(
+                    con,
+                    stack_identity=identity,
+                    resource_name=req.params.get('LogicalResourceId'))
 
         except Exception as ex:
             return exception.map_remote_error(ex)
 
-        result = [format_stack_resource(r) for r in resources]
+        arn_cache = {}
+        result = (format_stack_resource(r) for r in resources)
 
         return api_utils.format_response('DescribeStackResources',
                                          {'StackResources': result})
@@ -638,35 +847,27 @@ class StackController(object):
         """
         self._enforce(req, 'ListStackResources')
 
+        reformat = api_utils.reformat_dict_keys
+        resource_status = self._resource_status
+
         def format_resource_summary(r):
             """
             Reformat engine output into the AWS "StackResourceSummary" format
             """
-            keymap = {
-                engine_api.RES_UPDATED_TIME: 'LastUpdatedTimestamp',
-                engine_api.RES_NAME: 'LogicalResourceId',
-                engine_api.RES_PHYSICAL_ID: 'PhysicalResourceId',
-                engine_api.RES_STATUS_DATA: 'ResourceStatusReason',
-                engine_api.RES_TYPE: 'ResourceType',
-            }
+            result = reformat(_RESOURCE_SUMMARY_KEYMAP, r)
 
-            result = api_utils.reformat_dict_keys(keymap, r)
-
-            result['ResourceStatus'] = self._resource_status(r)
+            result['ResourceStatus'] = resource_status(r)
 
             return result
 
-        con = req.context
-
         try:
-            identity = self._get_identity(con, req.params['StackName'])
-            resources = self.engine_rpcapi.list_stack_resources(
-                con,
-                stack_identity=identity)
+            resources = self._call_for_stack(
+                req, req.params['StackName'],
+                self.engine_rpcapi.list_stack_resources)
         except Exception as ex:
             return exception.map_remote_error(ex)
 
-        summaries = [format_resource_summary(r) for r in resources]
+        summaries = (format_resource_summary(r) for r in resources)
 
         return api_utils.format_response('ListStackResources',
                                          {'StackResourceSummaries': summaries})
@@ -677,4 +878,5 @@ def create_resource(options):
     Stacks resource factory method.
     """
     deserializer = wsgi.JSONRequestDeserializer()
-    return wsgi.Resource(StackController(options), deserializer)
+    resource = wsgi.Resource(StackController(options), deserializer)
+    return compression.CompressionMiddleware(resource)
@@ -142,8 +142,8 @@ class WatchController(object):
         except rpc_common.RemoteError as ex:
             return exception.map_remote_error(ex)
 
-        res = {'MetricAlarms': [format_metric_alarm(a)
-                                for a in watch_list]}
+        res = {'MetricAlarms': (format_metric_alarm(a)
+                                for a in watch_list)}
 
         result = api_utils.format_response("DescribeAlarms", res)
         return result
@@ -234,11 +234,8 @@ class WatchController(object):
         except rpc_common.RemoteError as ex:
             return exception.map_remote_error(ex)
 
-        res = {'Metrics': []}
-        for d in watch_data:
-            metric = format_metric_data(d, filter_result)
-            if metric:
-                res['Metrics'].append(metric)
+        metrics = (format_metric_data(d, filter_result) for d in watch_data)
+        res = {'Metrics': (m for m in metrics if m)}
 
         result = api_utils.format_response("ListMetrics", res)
         return result
@@ -0,0 +1,102 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""A middleware that compresses response bodies, according to the encodings
+the client advertises in the Accept-Encoding request header.
+"""
+
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+import webob.dec
+
+from heat.common import wsgi
+
+
+class CompressionMiddleware(wsgi.Middleware):
+    """A middleware that compresses response bodies with gzip (or brotli,
+    when it is available and the client prefers it).
+
+    Bodies of known length smaller than MIN_SIZE bytes are passed through
+    uncompressed. Streamed bodies, whose length is unknown, are compressed
+    chunk by chunk as they are sent.
+    """
+
+    MIN_SIZE = 1024
+
+    # Low compression levels give most of the size reduction for a small
+    # fraction of the CPU cost of the defaults
+    GZIP_LEVEL = 1
+    BROTLI_QUALITY = 4
+
+    def _encoding(self, req, response):
+        if response.content_encoding or response.status_int in (204, 304):
+            return None
+        if (response.content_length is not None and
+                response.content_length < self.MIN_SIZE):
+            return None
+        if not req.headers.get('Accept-Encoding'):
+            return None
+
+        offers = ['gzip']
+        if brotli is not None:
+            offers.insert(0, 'br')
+        return req.accept_encoding.best_match(offers)
+
+    def _compressor(self, encoding):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.BROTLI_QUALITY)
+            # The brotli package names the streaming method process(), the
+            # brotlipy package (also imported as brotli) names it compress()
+            process = getattr(compressor, 'process', None)
+            if process is None:
+                process = compressor.compress
+            return process, compressor.finish
+        compressor = zlib.compressobj(self.GZIP_LEVEL, zlib.DEFLATED,
+                                      16 + zlib.MAX_WBITS)
+        return compressor.compress, compressor.flush
+
+    def _compress_iter(self, app_iter, encoding):
+        compress, flush = self._compressor(encoding)
+        try:
+            for chunk in app_iter:
+                data = compress(chunk)
+                if data:
+                    yield data
+            yield flush()
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+
+    @webob.dec.wsgify
+    def __call__(self, req):
+        response = req.get_response(self.application)
+
+        encoding = self._encoding(req, response)
+        if encoding is None:
+            return response
+
+        if response.content_length is None:
+            response.app_iter = self._compress_iter(response.app_iter,
+                                                    encoding)
+        else:
+            response.body = ''.join(self._compress_iter([response.body],
+                                                        encoding))
+        response.content_encoding = encoding
+        response.vary = tuple(response.vary or ()) + ('Accept-Encoding',)
+        return response
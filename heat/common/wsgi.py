@@ -568,19 +568,28 @@ class JSONRequestDeserializer(object):
 
 class JSONResponseSerializer(object):
 
-    def to_json(self, data):
+    def dumps(self, data):
+        """Serialize data to JSON, without logging the result."""
         def sanitizer(obj):
             if isinstance(obj, datetime.datetime):
                 return obj.isoformat()
             return obj
 
-        response = json.dumps(data, default=sanitizer)
+        return json.dumps(data, default=sanitizer)
+
+    def to_json(self, data):
+        response = self.dumps(data)
         logging.debug("JSON response : %s" % response)
         return response
 
     def default(self, response, result):
         response.content_type = 'application/json'
-        response.body = self.to_json(result)
+        if hasattr(result, 'to_json'):
+            # Streamed response, serialized in chunks as it is sent
+            response.content_length = None
+            response.app_iter = result.to_json(self)
+        else:
+            response.body = self.to_json(result)
 
 
 # Escape XML serialization for these keys, as the AWS API defines them as
@@ -622,7 +631,12 @@ class XMLResponseSerializer(object):
 
     def default(self, response, result):
         response.content_type = 'application/xml'
-        response.body = self.to_xml(result)
+        if hasattr(result, 'to_xml'):
+            # Streamed response, serialized in chunks as it is sent
+            response.content_length = None
+            response.app_iter = result.to_xml(self)
+        else:
+            response.body = self.to_xml(result)
 
 
 class Resource(object):
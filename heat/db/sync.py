@@ -18,28 +18,51 @@ from __future__ import print_function
 
 import sys
 
-from heat.openstack.common import gettextutils
-
-gettextutils.install('heat')
-
 from oslo.config import cfg
 from heat.openstack.common import log as logging
-from heat.db import api
-from heat.db import migration
+from heat.openstack.common.gettextutils import _
 
 LOG = logging.getLogger(__name__)
 
 
+def sync():
+    """
+    Place the database under migration control and upgrade it to the latest
+    version, using the configuration already loaded into cfg.CONF.
+    """
+    # Imported here so that e.g. --help does not load the migration code
+    from heat.db import api
+    from heat.db import migration
+
+    api.configure()
+
+    migration.db_sync()
+
+
+def main(argv=None, setup_logging=False):
+    """
+    Load the configuration from the given command-line arguments and
+    synchronise the database. This may be called repeatedly from within one
+    process; unless setup_logging is set, it does not alter the caller's
+    logging configuration.
+    """
+    cfg.CONF(argv or [], project='heat', prog='heat-engine')
+    if setup_logging:
+        logging.setup('heat')
+    sync()
+
+
 if __name__ == '__main__':
     print('*******************************************', file=sys.stderr)
     print('Deprecated: use heat-manage db_sync instead', file=sys.stderr)
     print('*******************************************', file=sys.stderr)
-    cfg.CONF(project='heat', prog='heat-engine')
-
-    api.configure()
 
     try:
-        migration.db_sync()
-    except Exception as exc:
+        main(sys.argv[1:], setup_logging=True)
+    except (cfg.Error, logging.LogConfigError) as exc:
+        # Raised before logging is set up, so report these directly
         print(str(exc), file=sys.stderr)
         sys.exit(1)
+    except Exception:
+        LOG.exception(_('Database sync failed'))
+        sys.exit(1)
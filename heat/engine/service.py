@@ -71,6 +71,9 @@ class EngineService(service.Service):
     are also dynamically added and will be named as keyword arguments
     by the RPC caller.
     """
+
+    RPC_API_VERSION = '1.1'
+
     def __init__(self, host, topic, manager=None):
         super(EngineService, self).__init__(host, topic)
         # stg == "Stack Thread Groups"
@@ -161,6 +164,11 @@ class EngineService(service.Service):
             raise exception.StackNotFound(stack_name=stack_name)
 
     def _get_stack(self, cnxt, stack_identity, show_deleted=False):
+        if isinstance(stack_identity, basestring):
+            # Since RPC API version 1.1, the name (or UUID) of a stack may be
+            # passed in place of its full identifier
+            stack_identity = self.identify_stack(cnxt, stack_identity)
+
         identity = identifier.HeatIdentifier(**stack_identity)
 
         if identity.tenant != cnxt.tenant_id:
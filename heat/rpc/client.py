@@ -29,6 +29,8 @@ class EngineClient(heat.openstack.common.rpc.proxy.RpcProxy):
     API version history:
 
         1.0 - Initial version.
+        1.1 - Accept a stack name in place of stack_identity in calls which
+              operate on an existing stack.
     '''
 
     BASE_RPC_API_VERSION = '1.0'
@@ -38,6 +40,14 @@ class EngineClient(heat.openstack.common.rpc.proxy.RpcProxy):
             topic=api.ENGINE_TOPIC,
             default_version=self.BASE_RPC_API_VERSION)
 
+    @staticmethod
+    def _stack_version(stack_identity):
+        '''
+        Return the API version required for the given stack_identity, which
+        may be a stack name (requiring version 1.1) or a full identifier.
+        '''
+        return '1.1' if isinstance(stack_identity, basestring) else None
+
     def identify_stack(self, ctxt, stack_name):
         """
         The identify_stack method returns the full stack identifier for a
@@ -66,7 +76,8 @@ class EngineClient(heat.openstack.common.rpc.proxy.RpcProxy):
                                show all
         """
         return self.call(ctxt, self.make_msg('show_stack',
-                                             stack_identity=stack_identity))
+                                             stack_identity=stack_identity),
+                         version=self._stack_version(stack_identity))
 
     def create_stack(self, ctxt, stack_name, template, params, files, args):
         """
@@ -137,7 +148,8 @@ class EngineClient(heat.openstack.common.rpc.proxy.RpcProxy):
         :param stack_name: Name of the stack you want to see.
         """
         return self.call(ctxt, self.make_msg('get_template',
-                                             stack_identity=stack_identity))
+                                             stack_identity=stack_identity),
+                         version=self._stack_version(stack_identity))
 
     def delete_stack(self, ctxt, stack_identity, cast=True):
         """
@@ -150,7 +162,8 @@ class EngineClient(heat.openstack.common.rpc.proxy.RpcProxy):
         rpc_method = self.cast if cast else self.call
         return rpc_method(ctxt,
                           self.make_msg('delete_stack',
-                                        stack_identity=stack_identity))
+                                        stack_identity=stack_identity),
+                          version=self._stack_version(stack_identity))
 
     def list_resource_types(self, ctxt):
         """
@@ -187,7 +200,8 @@ class EngineClient(heat.openstack.common.rpc.proxy.RpcProxy):
         :param stack_identity: Name of the stack you want to get events for.
         """
         return self.call(ctxt, self.make_msg('list_events',
-                                             stack_identity=stack_identity))
+                                             stack_identity=stack_identity),
+                         version=self._stack_version(stack_identity))
 
     def describe_stack_resource(self, ctxt, stack_identity, resource_name):
         """
@@ -198,7 +212,8 @@ class EngineClient(heat.openstack.common.rpc.proxy.RpcProxy):
         """
         return self.call(ctxt, self.make_msg('describe_stack_resource',
                                              stack_identity=stack_identity,
-                                             resource_name=resource_name))
+                                             resource_name=resource_name),
+                         version=self._stack_version(stack_identity))
 
     def find_physical_resource(self, ctxt, physical_resource_id):
         """
@@ -221,7 +236,8 @@ class EngineClient(heat.openstack.common.rpc.proxy.RpcProxy):
         """
         return self.call(ctxt, self.make_msg('describe_stack_resources',
                                              stack_identity=stack_identity,
-                                             resource_name=resource_name))
+                                             resource_name=resource_name),
+                         version=self._stack_version(stack_identity))
 
     def list_stack_resources(self, ctxt, stack_identity):
         """
@@ -230,7 +246,8 @@ class EngineClient(heat.openstack.common.rpc.proxy.RpcProxy):
         :param stack_identity: Name of the stack.
         """
         return self.call(ctxt, self.make_msg('list_stack_resources',
-                                             stack_identity=stack_identity))
+                                             stack_identity=stack_identity),
+                         version=self._stack_version(stack_identity))
 
     def stack_suspend(self, ctxt, stack_identity):
         return self.call(ctxt, self.make_msg('stack_suspend',
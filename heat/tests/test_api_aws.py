@@ -12,9 +12,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+
+from lxml import etree
 
 from heat.tests.common import HeatTestCase
 from heat.api.aws import utils as api_utils
+from heat.common import wsgi
 
 
 class AWSCommonTest(HeatTestCase):
@@ -183,3 +187,85 @@ class AWSCommonTest(HeatTestCase):
         expected = {"bar": 123}
         result = api_utils.reformat_dict_keys(keymap, data)
         self.assertEqual(result, expected)
+
+    def test_reformat_dict_keys_pairs(self):
+        keymap = (("foo", "bar"), ("foo2", "bar2"))
+        data = {"foo": 123, "baz": 456}
+        expected = {"bar": 123}
+        result = api_utils.reformat_dict_keys(keymap, data)
+        self.assertEqual(result, expected)
+
+    def test_format_response_streaming(self):
+        items = ({'Name': n} for n in ('foo', 'bar'))
+        response = api_utils.format_response_streaming("Foo", items, "Items")
+        expected = {'FooResponse': {'FooResult': {'Items': [{'Name': 'foo'},
+                                                            {'Name': 'bar'}]}}}
+        self.assertEqual(response.to_dict(), expected)
+
+    def test_format_response_iterator(self):
+        items = iter([{'Name': 'foo'}])
+        response = api_utils.format_response("Foo", {'Items': items})
+        self.assertTrue(isinstance(response, api_utils.StreamingResponse))
+        expected = {'FooResponse': {'FooResult': {'Items': [{'Name': 'foo'}]}}}
+        self.assertEqual(response.to_dict(), expected)
+
+    def test_format_response_streaming_first_error(self):
+        def items():
+            raise KeyError('Name')
+            yield
+
+        # An error formatting the first item is raised immediately
+        self.assertRaises(KeyError, api_utils.format_response,
+                          "Foo", {'Items': items()})
+
+    def test_format_response_streaming_later_error(self):
+        def items():
+            yield {'Name': 'foo'}
+            raise KeyError('Name')
+
+        serializer = wsgi.JSONResponseSerializer()
+        response = api_utils.format_response("Foo", {'Items': items()})
+        self.assertRaises(KeyError, list, response.to_json(serializer))
+
+    def test_format_response_streaming_xml(self):
+        items = [{'Name': 'foo'}, {'Name': 'bar'}]
+        serializer = wsgi.XMLResponseSerializer()
+        response = api_utils.format_response_streaming("Foo", iter(items),
+                                                       "Items")
+        expected = serializer.to_xml(
+            api_utils.format_response("Foo", {'Items': items}))
+        self.assertEqual(''.join(response.to_xml(serializer)), expected)
+
+    def test_format_response_streaming_xml_empty(self):
+        serializer = wsgi.XMLResponseSerializer()
+        response = api_utils.format_response_streaming("Foo", iter([]),
+                                                       "Items")
+        expected = serializer.to_xml(
+            api_utils.format_response("Foo", {'Items': []}))
+        # An empty list is streamed as <Items></Items> rather than <Items/>,
+        # so compare the parsed documents
+        self.assertEqual(
+            etree.tostring(etree.fromstring(expected)),
+            etree.tostring(etree.fromstring(
+                ''.join(response.to_xml(serializer)))))
+
+    def test_format_response_streaming_json(self):
+        items = [{'Name': 'foo'}, {'Name': 'bar'}]
+        serializer = wsgi.JSONResponseSerializer()
+        response = api_utils.format_response_streaming("Foo", iter(items),
+                                                       "Items")
+        expected = serializer.to_json(
+            api_utils.format_response("Foo", {'Items': items}))
+        self.assertEqual(''.join(response.to_json(serializer)), expected)
+
+    def test_format_response_streaming_chunks(self):
+        items = [{'Name': 'x' * 100} for i in range(1000)]
+        serializer = wsgi.JSONResponseSerializer()
+        response = api_utils.format_response_streaming("Foo", iter(items),
+                                                       "Items")
+        chunks = list(response.to_json(serializer))
+        self.assertTrue(len(chunks) > 1)
+        for chunk in chunks[:-1]:
+            self.assertTrue(len(chunk) >= response.CHUNK_SIZE)
+        self.assertEqual(json.loads(''.join(chunks)),
+                         api_utils.format_response("Foo", {'Items': items}))
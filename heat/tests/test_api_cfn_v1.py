@@ -21,6 +21,7 @@ from heat.common import exception as heat_exception
 from heat.common import identifier
 from heat.common import policy
 from heat.openstack.common import rpc
+from heat.openstack.common.rpc import common as rpc_common
 from heat.common.wsgi import Request
 from heat.rpc import api as rpc_api
 from heat.api.aws import exception
@@ -94,6 +95,92 @@ class CfnStackControllerTest(HeatTestCase):
                     'StackId': 'arn:openstack:heat::t:stacks/Foo/123'}
         self.assertEqual(response, expected)
 
+    def test_identity_from_arn_name(self):
+        # A plain stack name should not be parsed as an ARN
+        self.m.StubOutWithMock(identifier.HeatIdentifier, 'from_arn')
+        self.m.ReplayAll()
+
+        self.assertEqual(None,
+                         self.controller._identity_from_arn('wordpress'))
+
+    def test_identity_from_arn(self):
+        identity = identifier.HeatIdentifier('t', 'wordpress', '6')
+        self.m.ReplayAll()
+
+        self.assertEqual(dict(identity),
+                         self.controller._identity_from_arn(identity.arn()))
+
+    def test_ttl_cache(self):
+        calls = []
+
+        @stacks._ttl_cache(maxsize=2, ttl=30)
+        def fetch(url):
+            calls.append(url)
+            return url.upper()
+
+        self.assertEqual('A', fetch('a'))
+        self.assertEqual('A', fetch('a'))
+        self.assertEqual(['a'], calls)
+
+        # Adding a third result evicts the oldest
+        self.assertEqual('B', fetch('b'))
+        self.assertEqual('C', fetch('c'))
+        self.assertEqual('A', fetch('a'))
+        self.assertEqual(['a', 'b', 'c', 'a'], calls)
+
+    def test_ttl_cache_expired(self):
+        calls = []
+
+        @stacks._ttl_cache(maxsize=2, ttl=30)
+        def fetch(url):
+            calls.append(url)
+            return url.upper()
+
+        self.m.StubOutWithMock(stacks.time, 'time')
+        stacks.time.time().AndReturn(100)
+        stacks.time.time().AndReturn(129)
+        stacks.time.time().AndReturn(130)
+        self.m.ReplayAll()
+
+        self.assertEqual('A', fetch('a'))
+        self.assertEqual('A', fetch('a'))
+        self.assertEqual('A', fetch('a'))
+        self.assertEqual(['a', 'a'], calls)
+
+    def test_get_template_url_cached(self):
+        url = 'http://example.com/template'
+        params = {'Action': 'ValidateTemplate', 'TemplateUrl': url}
+        dummy_req = self._dummy_GET_request(params)
+
+        stacks._fetch_template.cache_clear()
+        self.addCleanup(stacks._fetch_template.cache_clear)
+
+        # Only a single fetch is expected for repeated calls
+        self.m.StubOutWithMock(stacks.urlfetch, 'get')
+        stacks.urlfetch.get(url).AndReturn('{"Resources": {}}')
+        self.m.ReplayAll()
+
+        for i in range(2):
+            self.assertEqual('{"Resources": {}}',
+                             self.controller._get_template(dummy_req))
+
+    def test_stackid_addprefix_cached(self):
+        self.m.ReplayAll()
+
+        stack_id = {u'tenant': u't',
+                    u'stack_name': u'Foo',
+                    u'stack_id': u'123',
+                    u'path': u''}
+        arn_cache = {}
+        for i in range(2):
+            response = self.controller._id_format({'StackId': stack_id},
+                                                  arn_cache)
+            self.assertEqual(
+                {'StackId': 'arn:openstack:heat::t:stacks/Foo/123'},
+                response)
+        self.assertEqual(['arn:openstack:heat::t:stacks/Foo/123'],
+                         arn_cache.values())
+
     def test_enforce_ok(self):
         params = {'Action': 'ListStacks'}
         dummy_req = self._dummy_GET_request(params)
@@ -109,6 +196,38 @@ class CfnStackControllerTest(HeatTestCase):
         self.assertRaises(exception.HeatAccessDeniedError,
                           self.controller._enforce, dummy_req, 'ListStacks')
 
+    def test_enforce_cached(self):
+        params = {'Action': 'ListStacks'}
+        dummy_req = self._dummy_GET_request(params)
+        # Policy is only evaluated on the first call
+        self._stub_enforce(dummy_req, 'ListStacks')
+        self.assertEqual(None,
+                         self.controller._enforce(dummy_req, 'ListStacks'))
+        self.assertEqual(None,
+                         self.controller._enforce(dummy_req, 'ListStacks'))
+
+    def test_enforce_denied_cached(self):
+        params = {'Action': 'ListStacks'}
+        dummy_req = self._dummy_GET_request(params)
+        # Policy is only evaluated on the first call
+        self._stub_enforce(dummy_req, 'ListStacks', False)
+        self.assertRaises(exception.HeatAccessDeniedError,
+                          self.controller._enforce, dummy_req, 'ListStacks')
+        self.assertRaises(exception.HeatAccessDeniedError,
+                          self.controller._enforce, dummy_req, 'ListStacks')
+
+    def test_enforce_cache_full(self):
+        params = {'Action': 'ListStacks'}
+        dummy_req = self._dummy_GET_request(params)
+        self._stub_enforce(dummy_req, 'ListStacks')
+
+        # Adding a decision to a full cache empties it first
+        self.controller._check_policy_cache()
+        self.controller.POLICY_CACHE_SIZE = 2
+        self.controller._policy_cache.update({'foo': True, 'bar': False})
+        self.controller._enforce(dummy_req, 'ListStacks')
+        self.assertEqual(1, len(self.controller._policy_cache))
+
     def test_enforce_ise(self):
         params = {'Action': 'ListStacks'}
         dummy_req = self._dummy_GET_request(params)
@@ -161,7 +280,7 @@ class CfnStackControllerTest(HeatTestCase):
                       u'CreationTime': u'2012-07-09T09:12:45Z',
                       u'StackName': u'wordpress',
                       u'StackStatus': u'CREATE_COMPLETE'}]}}}
-        self.assertEqual(result, expected)
+        self.assertEqual(result.to_dict(), expected)
         self.m.VerifyAll()
 
     def test_list_rmt_aterr(self):
@@ -212,7 +331,6 @@ class CfnStackControllerTest(HeatTestCase):
     def test_describe(self):
         # Format a dummy GET request to pass into the WSGI handler
         stack_name = u"wordpress"
-        identity = dict(identifier.HeatIdentifier('t', stack_name, '6'))
         params = {'Action': 'DescribeStacks', 'StackName': stack_name}
         dummy_req = self._dummy_GET_request(params)
         self._stub_enforce(dummy_req, 'DescribeStacks')
@@ -248,16 +366,11 @@ class CfnStackControllerTest(HeatTestCase):
                        u'capabilities':[]}]
 
         self.m.StubOutWithMock(rpc, 'call')
-        rpc.call(dummy_req.context, self.topic,
-                 {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None).AndReturn(identity)
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'show_stack',
-                  'args': {'stack_identity': identity},
-                  'version': self.api_version}, None).AndReturn(engine_resp)
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None).AndReturn(engine_resp)
 
         self.m.ReplayAll()
 
@@ -296,7 +409,53 @@ class CfnStackControllerTest(HeatTestCase):
                         'DisableRollback': 'true',
                         'LastUpdatedTime': u'2012-07-09T09:13:11Z'}]}}}
 
-        self.assertEqual(response, expected)
+        self.assertEqual(response.to_dict(), expected)
+
+    def test_describe_old_engine(self):
+        # Engines older than RPC API version 1.1 can't resolve stack names
+        stack_name = u"wordpress"
+        identity = dict(identifier.HeatIdentifier('t', stack_name, '6'))
+        params = {'Action': 'DescribeStacks', 'StackName': stack_name}
+        dummy_req = self._dummy_GET_request(params)
+        self._stub_enforce(dummy_req, 'DescribeStacks')
+
+        self.m.StubOutWithMock(rpc, 'call')
+        rpc.call(dummy_req.context, self.topic,
+                 {'namespace': None,
+                  'method': 'show_stack',
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None
+                 ).AndRaise(rpc_common.RemoteError('UnsupportedRpcVersion'))
+        rpc.call(dummy_req.context, self.topic,
+                 {'namespace': None,
+                  'method': 'identify_stack',
+                  'args': {'stack_name': stack_name},
+                  'version': self.api_version}, None).AndReturn(identity)
+        rpc.call(dummy_req.context, self.topic,
+                 {'namespace': None,
+                  'method': 'show_stack',
+                  'args': {'stack_identity': identity},
+                  'version': self.api_version}, None).AndReturn([])
+
+        # Subsequent requests skip the version 1.1 call
+        rpc.call(dummy_req.context, self.topic,
+                 {'namespace': None,
+                  'method': 'identify_stack',
+                  'args': {'stack_name': stack_name},
+                  'version': self.api_version}, None).AndReturn(identity)
+        rpc.call(dummy_req.context, self.topic,
+                 {'namespace': None,
+                  'method': 'show_stack',
+                  'args': {'stack_identity': identity},
+                  'version': self.api_version}, None).AndReturn([])
+
+        self.m.ReplayAll()
+
+        expected = {'DescribeStacksResponse':
+                    {'DescribeStacksResult': {'Stacks': []}}}
+        for i in range(2):
+            response = self.controller.describe(dummy_req)
+            self.assertEqual(expected, response.to_dict())
 
     def test_describe_arn(self):
         # Format a dummy GET request to pass into the WSGI handler
@@ -381,7 +540,7 @@ class CfnStackControllerTest(HeatTestCase):
                         'DisableRollback': 'true',
                         'LastUpdatedTime': u'2012-07-09T09:13:11Z'}]}}}
 
-        self.assertEqual(response, expected)
+        self.assertEqual(response.to_dict(), expected)
 
     def test_describe_arn_invalidtenant(self):
         # Format a dummy GET request to pass into the WSGI handler
@@ -409,7 +568,6 @@ class CfnStackControllerTest(HeatTestCase):
 
     def test_describe_aterr(self):
         stack_name = "wordpress"
-        identity = dict(identifier.HeatIdentifier('t', stack_name, '6'))
         params = {'Action': 'DescribeStacks', 'StackName': stack_name}
         dummy_req = self._dummy_GET_request(params)
         self._stub_enforce(dummy_req, 'DescribeStacks')
@@ -417,16 +575,11 @@ class CfnStackControllerTest(HeatTestCase):
         # Insert an engine RPC error and ensure we map correctly to the
         # heat exception type
         self.m.StubOutWithMock(rpc, 'call')
-        rpc.call(dummy_req.context, self.topic,
-                 {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None).AndReturn(identity)
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'show_stack',
-                  'args': {'stack_identity': identity},
-                  'version': self.api_version}, None
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None
                  ).AndRaise(AttributeError())
 
         self.m.ReplayAll()
@@ -446,9 +599,9 @@ class CfnStackControllerTest(HeatTestCase):
         self.m.StubOutWithMock(rpc, 'call')
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None
+                  'method': 'show_stack',
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None
                  ).AndRaise(heat_exception.StackNotFound())
 
         self.m.ReplayAll()
@@ -778,8 +931,7 @@ class CfnStackControllerTest(HeatTestCase):
                   'version': self.api_version}, None
                  ).AndRaise(AttributeError())
 
-        policy.Enforcer.enforce(dummy_req.context, 'CreateStack', {}
-                                ).AndReturn(True)
+        # The policy decision is cached, so only the first request checks it
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'create_stack',
@@ -791,8 +943,6 @@ class CfnStackControllerTest(HeatTestCase):
                   'version': self.api_version}, None
                  ).AndRaise(heat_exception.UnknownUserParameter())
 
-        policy.Enforcer.enforce(dummy_req.context, 'CreateStack', {}
-                                ).AndReturn(True)
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'create_stack',
@@ -978,7 +1128,6 @@ class CfnStackControllerTest(HeatTestCase):
     def test_get_template(self):
         # Format a dummy request
         stack_name = "wordpress"
-        identity = dict(identifier.HeatIdentifier('t', stack_name, '6'))
         template = {u'Foo': u'bar'}
         params = {'Action': 'GetTemplate', 'StackName': stack_name}
         dummy_req = self._dummy_GET_request(params)
@@ -988,16 +1137,11 @@ class CfnStackControllerTest(HeatTestCase):
         engine_resp = template
 
         self.m.StubOutWithMock(rpc, 'call')
-        rpc.call(dummy_req.context, self.topic,
-                 {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None).AndReturn(identity)
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'get_template',
-                  'args': {'stack_identity': identity},
-                  'version': self.api_version}, None).AndReturn(engine_resp)
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None).AndReturn(engine_resp)
 
         self.m.ReplayAll()
 
@@ -1011,7 +1155,6 @@ class CfnStackControllerTest(HeatTestCase):
 
     def test_get_template_err_rpcerr(self):
         stack_name = "wordpress"
-        identity = dict(identifier.HeatIdentifier('t', stack_name, '6'))
         template = {u'Foo': u'bar'}
         params = {'Action': 'GetTemplate', 'StackName': stack_name}
         dummy_req = self._dummy_GET_request(params)
@@ -1020,16 +1163,11 @@ class CfnStackControllerTest(HeatTestCase):
         # Insert an engine RPC error and ensure we map correctly to the
         # heat exception type
         self.m.StubOutWithMock(rpc, 'call')
-        rpc.call(dummy_req.context, self.topic,
-                 {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None).AndReturn(identity)
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'get_template',
-                  'args': {'stack_identity': identity},
-                  'version': self.api_version}, None
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None
                  ).AndRaise(AttributeError())
 
         self.m.ReplayAll()
@@ -1050,9 +1188,9 @@ class CfnStackControllerTest(HeatTestCase):
         self.m.StubOutWithMock(rpc, 'call')
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None
+                  'method': 'get_template',
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None
                  ).AndRaise(heat_exception.StackNotFound())
 
         self.m.ReplayAll()
@@ -1063,7 +1201,6 @@ class CfnStackControllerTest(HeatTestCase):
 
     def test_get_template_err_none(self):
         stack_name = "wordpress"
-        identity = dict(identifier.HeatIdentifier('t', stack_name, '6'))
         template = {u'Foo': u'bar'}
         params = {'Action': 'GetTemplate', 'StackName': stack_name}
         dummy_req = self._dummy_GET_request(params)
@@ -1074,16 +1211,11 @@ class CfnStackControllerTest(HeatTestCase):
         engine_resp = None
 
         self.m.StubOutWithMock(rpc, 'call')
-        rpc.call(dummy_req.context, self.topic,
-                 {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None).AndReturn(identity)
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'get_template',
-                  'args': {'stack_identity': identity},
-                  'version': self.api_version}, None).AndReturn(engine_resp)
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None).AndReturn(engine_resp)
 
         self.m.ReplayAll()
 
@@ -1151,24 +1283,18 @@ class CfnStackControllerTest(HeatTestCase):
     def test_delete(self):
         # Format a dummy request
         stack_name = "wordpress"
-        identity = dict(identifier.HeatIdentifier('t', stack_name, '1'))
         params = {'Action': 'DeleteStack', 'StackName': stack_name}
         dummy_req = self._dummy_GET_request(params)
         self._stub_enforce(dummy_req, 'DeleteStack')
 
         # Stub out the RPC call to the engine with a pre-canned response
         self.m.StubOutWithMock(rpc, 'call')
-        rpc.call(dummy_req.context, self.topic,
-                 {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None).AndReturn(identity)
         # Engine returns None when delete successful
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'delete_stack',
-                  'args': {'stack_identity': identity},
-                  'version': self.api_version}, None).AndReturn(None)
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None).AndReturn(None)
 
         self.m.ReplayAll()
 
@@ -1180,26 +1306,19 @@ class CfnStackControllerTest(HeatTestCase):
 
     def test_delete_err_rpcerr(self):
         stack_name = "wordpress"
-        identity = dict(identifier.HeatIdentifier('t', stack_name, '1'))
         params = {'Action': 'DeleteStack', 'StackName': stack_name}
         dummy_req = self._dummy_GET_request(params)
         self._stub_enforce(dummy_req, 'DeleteStack')
 
         # Stub out the RPC call to the engine with a pre-canned response
         self.m.StubOutWithMock(rpc, 'call')
-        rpc.call(dummy_req.context, self.topic,
-                 {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None).AndReturn(identity)
-
         # Insert an engine RPC error and ensure we map correctly to the
         # heat exception type
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'delete_stack',
-                  'args': {'stack_identity': identity},
-                  'version': self.api_version}, None
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None
                  ).AndRaise(AttributeError())
 
         self.m.ReplayAll()
@@ -1220,9 +1339,9 @@ class CfnStackControllerTest(HeatTestCase):
         self.m.StubOutWithMock(rpc, 'call')
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None
+                  'method': 'delete_stack',
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None
                  ).AndRaise(heat_exception.StackNotFound())
 
         self.m.ReplayAll()
@@ -1234,7 +1353,6 @@ class CfnStackControllerTest(HeatTestCase):
     def test_events_list(self):
         # Format a dummy request
         stack_name = "wordpress"
-        identity = dict(identifier.HeatIdentifier('t', stack_name, '6'))
         params = {'Action': 'DescribeStackEvents', 'StackName': stack_name}
         dummy_req = self._dummy_GET_request(params)
         self._stub_enforce(dummy_req, 'DescribeStackEvents')
@@ -1260,16 +1378,11 @@ class CfnStackControllerTest(HeatTestCase):
                         u'resource_type': u'AWS::EC2::Instance'}]
 
         self.m.StubOutWithMock(rpc, 'call')
-        rpc.call(dummy_req.context, self.topic,
-                 {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None).AndReturn(identity)
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'list_events',
-                  'args': {'stack_identity': identity},
-                  'version': self.api_version}, None).AndReturn(engine_resp)
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None).AndReturn(engine_resp)
 
         self.m.ReplayAll()
 
@@ -1290,11 +1403,10 @@ class CfnStackControllerTest(HeatTestCase):
                         'ResourceStatusReason': u'state changed',
                         'LogicalResourceId': u'WikiDatabase'}]}}}
 
-        self.assertEqual(response, expected)
+        self.assertEqual(response.to_dict(), expected)
 
     def test_events_list_err_rpcerr(self):
         stack_name = "wordpress"
-        identity = dict(identifier.HeatIdentifier('t', stack_name, '6'))
         params = {'Action': 'DescribeStackEvents', 'StackName': stack_name}
         dummy_req = self._dummy_GET_request(params)
         self._stub_enforce(dummy_req, 'DescribeStackEvents')
@@ -1302,16 +1414,11 @@ class CfnStackControllerTest(HeatTestCase):
         # Insert an engine RPC error and ensure we map correctly to the
         # heat exception type
         self.m.StubOutWithMock(rpc, 'call')
-        rpc.call(dummy_req.context, self.topic,
-                 {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None).AndReturn(identity)
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'list_events',
-                  'args': {'stack_identity': identity},
-                  'version': self.api_version}, None
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None
                  ).AndRaise(Exception())
 
         self.m.ReplayAll()
@@ -1331,9 +1438,9 @@ class CfnStackControllerTest(HeatTestCase):
         self.m.StubOutWithMock(rpc, 'call')
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None
+                  'method': 'list_events',
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None
                  ).AndRaise(heat_exception.StackNotFound())
 
         self.m.ReplayAll()
@@ -1345,7 +1452,6 @@ class CfnStackControllerTest(HeatTestCase):
     def test_describe_stack_resource(self):
         # Format a dummy request
         stack_name = "wordpress"
-        identity = dict(identifier.HeatIdentifier('t', stack_name, '6'))
         params = {'Action': 'DescribeStackResource',
                   'StackName': stack_name,
                   'LogicalResourceId': "WikiDatabase"}
@@ -1376,20 +1482,15 @@ class CfnStackControllerTest(HeatTestCase):
                        u'metadata': {u'wordpress': []}}
 
         self.m.StubOutWithMock(rpc, 'call')
-        rpc.call(dummy_req.context, self.topic,
-                 {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None).AndReturn(identity)
         args = {
-            'stack_identity': identity,
+            'stack_identity': stack_name,
             'resource_name': dummy_req.params.get('LogicalResourceId'),
         }
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'describe_stack_resource',
                   'args': args,
-                  'version': self.api_version}, None).AndReturn(engine_resp)
+                  'version': '1.1'}, None).AndReturn(engine_resp)
 
         self.m.ReplayAll()
 
@@ -1415,7 +1516,6 @@ class CfnStackControllerTest(HeatTestCase):
     def test_describe_stack_resource_nonexistent_stack(self):
         # Format a dummy request
         stack_name = "wibble"
-        identity = dict(identifier.HeatIdentifier('t', stack_name, '6'))
         params = {'Action': 'DescribeStackResource',
                   'StackName': stack_name,
                   'LogicalResourceId': "WikiDatabase"}
@@ -1426,10 +1526,11 @@ class CfnStackControllerTest(HeatTestCase):
         self.m.StubOutWithMock(rpc, 'call')
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version},
-                 None).AndRaise(heat_exception.StackNotFound())
+                  'method': 'describe_stack_resource',
+                  'args': {'stack_identity': stack_name,
+                           'resource_name': 'WikiDatabase'},
+                  'version': '1.1'}, None
+                 ).AndRaise(heat_exception.StackNotFound())
 
         self.m.ReplayAll()
 
@@ -1440,7 +1541,6 @@ class CfnStackControllerTest(HeatTestCase):
     def test_describe_stack_resource_nonexistent(self):
         # Format a dummy request
         stack_name = "wordpress"
-        identity = dict(identifier.HeatIdentifier('t', stack_name, '6'))
         params = {'Action': 'DescribeStackResource',
                   'StackName': stack_name,
                   'LogicalResourceId': "wibble"}
@@ -1449,20 +1549,15 @@ class CfnStackControllerTest(HeatTestCase):
 
         # Stub out the RPC call to the engine with a pre-canned response
         self.m.StubOutWithMock(rpc, 'call')
-        rpc.call(dummy_req.context, self.topic,
-                 {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None).AndReturn(identity)
         args = {
-            'stack_identity': identity,
+            'stack_identity': stack_name,
             'resource_name': dummy_req.params.get('LogicalResourceId'),
         }
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'describe_stack_resource',
                   'args': args,
-                  'version': self.api_version},
+                  'version': '1.1'},
                  None).AndRaise(heat_exception.ResourceNotFound())
 
         self.m.ReplayAll()
@@ -1474,7 +1569,6 @@ class CfnStackControllerTest(HeatTestCase):
     def test_describe_stack_resources(self):
         # Format a dummy request
         stack_name = "wordpress"
-        identity = dict(identifier.HeatIdentifier('t', stack_name, '6'))
         params = {'Action': 'DescribeStackResources',
                   'StackName': stack_name,
                   'LogicalResourceId': "WikiDatabase"}
@@ -1505,20 +1599,15 @@ class CfnStackControllerTest(HeatTestCase):
                         u'metadata': {u'ensureRunning': u'true''true'}}]
 
         self.m.StubOutWithMock(rpc, 'call')
-        rpc.call(dummy_req.context, self.topic,
-                 {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None).AndReturn(identity)
         args = {
-            'stack_identity': identity,
+            'stack_identity': stack_name,
             'resource_name': dummy_req.params.get('LogicalResourceId'),
         }
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'describe_stack_resources',
                   'args': args,
-                  'version': self.api_version}, None).AndReturn(engine_resp)
+                  'version': '1.1'}, None).AndReturn(engine_resp)
 
         self.m.ReplayAll()
 
@@ -1538,7 +1627,7 @@ class CfnStackControllerTest(HeatTestCase):
                        u'a3455d8c-9f88-404d-a85b-5315293e67de',
                        'LogicalResourceId': u'WikiDatabase'}]}}}
 
-        self.assertEqual(response, expected)
+        self.assertEqual(response.to_dict(), expected)
 
     def test_describe_stack_resources_bad_name(self):
         stack_name = "wibble"
@@ -1553,9 +1642,10 @@ class CfnStackControllerTest(HeatTestCase):
         self.m.StubOutWithMock(rpc, 'call')
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None
+                  'method': 'describe_stack_resources',
+                  'args': {'stack_identity': stack_name,
+                           'resource_name': 'WikiDatabase'},
+                  'version': '1.1'}, None
                  ).AndRaise(heat_exception.StackNotFound())
 
         self.m.ReplayAll()
@@ -1632,7 +1722,7 @@ class CfnStackControllerTest(HeatTestCase):
                        u'a3455d8c-9f88-404d-a85b-5315293e67de',
                        'LogicalResourceId': u'WikiDatabase'}]}}}
 
-        self.assertEqual(response, expected)
+        self.assertEqual(response.to_dict(), expected)
 
     def test_describe_stack_resources_physical_not_found(self):
         # Format a dummy request
@@ -1679,7 +1769,6 @@ class CfnStackControllerTest(HeatTestCase):
     def test_list_stack_resources(self):
         # Format a dummy request
         stack_name = "wordpress"
-        identity = dict(identifier.HeatIdentifier('t', stack_name, '6'))
         params = {'Action': 'ListStackResources',
                   'StackName': stack_name}
         dummy_req = self._dummy_GET_request(params)
@@ -1706,16 +1795,11 @@ class CfnStackControllerTest(HeatTestCase):
                         u'resource_type': u'AWS::EC2::Instance'}]
 
         self.m.StubOutWithMock(rpc, 'call')
-        rpc.call(dummy_req.context, self.topic,
-                 {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None).AndReturn(identity)
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'list_stack_resources',
-                 'args': {'stack_identity': identity},
-                 'version': self.api_version}, None).AndReturn(engine_resp)
+                 'args': {'stack_identity': stack_name},
+                 'version': '1.1'}, None).AndReturn(engine_resp)
 
         self.m.ReplayAll()
 
@@ -1731,7 +1815,7 @@ class CfnStackControllerTest(HeatTestCase):
                        u'a3455d8c-9f88-404d-a85b-5315293e67de',
                        'LogicalResourceId': u'WikiDatabase'}]}}}
 
-        self.assertEqual(response, expected)
+        self.assertEqual(response.to_dict(), expected)
 
     def test_list_stack_resources_bad_name(self):
         stack_name = "wibble"
@@ -1745,9 +1829,9 @@ class CfnStackControllerTest(HeatTestCase):
         self.m.StubOutWithMock(rpc, 'call')
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
-                  'method': 'identify_stack',
-                  'args': {'stack_name': stack_name},
-                  'version': self.api_version}, None
+                  'method': 'list_stack_resources',
+                  'args': {'stack_identity': stack_name},
+                  'version': '1.1'}, None
                  ).AndRaise(heat_exception.StackNotFound())
 
         self.m.ReplayAll()
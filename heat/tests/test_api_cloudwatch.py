@@ -171,7 +171,8 @@ class WatchControllerTest(HeatTestCase):
                          }]}}}
 
         # Call the list controller function and compare the response
-        self.assertEqual(expected, self.controller.describe_alarms(dummy_req))
+        self.assertEqual(expected,
+                         self.controller.describe_alarms(dummy_req).to_dict())
 
     def test_describe_alarms_for_metric(self):
         # Not yet implemented, should raise HeatAPINotImplementedError
@@ -276,7 +277,8 @@ class WatchControllerTest(HeatTestCase):
                                    'MetricName': u'ServiceFailure3'}]}}}
 
         # First pass no query paramters filtering, should get all three
-        self.assertEqual(expected, self.controller.list_metrics(dummy_req))
+        self.assertEqual(expected,
+                         self.controller.list_metrics(dummy_req).to_dict())
 
     def test_list_metrics_filter_name(self):
 
@@ -335,7 +337,8 @@ class WatchControllerTest(HeatTestCase):
                           'Value': 1}],
                         'MetricName': u'ServiceFailure'}]}}}
         # First pass no query paramters filtering, should get all three
-        self.assertEqual(expected, self.controller.list_metrics(dummy_req))
+        self.assertEqual(expected,
+                         self.controller.list_metrics(dummy_req).to_dict())
 
     def test_list_metrics_filter_namespace(self):
 
@@ -404,7 +407,8 @@ class WatchControllerTest(HeatTestCase):
                          {'Name': u'Value',
                           'Value': 1}],
                         'MetricName': u'ServiceFailure2'}]}}}
-        self.assertEqual(expected, self.controller.list_metrics(dummy_req))
+        self.assertEqual(expected,
+                         self.controller.list_metrics(dummy_req).to_dict())
 
     def test_put_metric_alarm(self):
         # Not yet implemented, should raise HeatAPINotImplementedError
@@ -0,0 +1,150 @@
+# -*- encoding: utf-8 -*-
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import zlib
+
+import fixtures
+import webob
+import webob.dec
+
+from heat.api.middleware import compression
+
+from heat.tests.common import HeatTestCase
+
+
+BODY = '<member><StackName>wordpress</StackName></member>' * 100
+
+
+@webob.dec.wsgify
+def body_app(req):
+    return webob.Response(body=BODY)
+
+
+@webob.dec.wsgify
+def small_body_app(req):
+    return webob.Response(body='<Small/>')
+
+
+@webob.dec.wsgify
+def streaming_app(req):
+    response = webob.Response()
+    response.content_length = None
+    response.app_iter = iter([BODY[:1000], BODY[1000:]])
+    return response
+
+
+class FakeBrotli(object):
+    """A stand-in for the brotli module, with a trivial "compression"."""
+
+    class Compressor(object):
+        def __init__(self, quality):
+            self.quality = quality
+            self.data = []
+
+        def process(self, data):
+            self.data.append(data)
+            return ''
+
+        def finish(self):
+            return 'br:%d:%s' % (self.quality, ''.join(self.data))
+
+
+class FakeBrotlipy(object):
+    """A stand-in for the brotlipy module, which is also named brotli."""
+
+    class Compressor(object):
+        def __init__(self, quality):
+            self.quality = quality
+            self.data = []
+
+        def compress(self, data):
+            self.data.append(data)
+            return ''
+
+        def finish(self):
+            return 'br:%d:%s' % (self.quality, ''.join(self.data))
+
+
+class CompressionMiddlewareTest(HeatTestCase):
+
+    def setUp(self):
+        super(CompressionMiddlewareTest, self).setUp()
+        self.useFixture(fixtures.MonkeyPatch(
+            'heat.api.middleware.compression.brotli', None))
+
+    def _get(self, app, accept_encoding=None):
+        headers = {}
+        if accept_encoding is not None:
+            headers['Accept-Encoding'] = accept_encoding
+        request = webob.Request.blank('/', headers=headers)
+        return request.get_response(compression.CompressionMiddleware(app))
+
+    def _gunzip(self, data):
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+
+    def test_gzip(self):
+        response = self._get(body_app, 'gzip, deflate')
+        self.assertEqual('gzip', response.content_encoding)
+        self.assertIn('Accept-Encoding', response.vary)
+        self.assertTrue(len(response.body) < len(BODY))
+        self.assertEqual(len(response.body), response.content_length)
+        self.assertEqual(BODY, self._gunzip(response.body))
+
+    def test_gzip_streaming(self):
+        response = self._get(streaming_app, 'gzip')
+        self.assertEqual('gzip', response.content_encoding)
+        self.assertEqual(BODY, self._gunzip(''.join(response.app_iter)))
+
+    def test_no_accept_encoding(self):
+        response = self._get(body_app)
+        self.assertIsNone(response.content_encoding)
+        self.assertEqual(BODY, response.body)
+
+    def test_unsupported_encoding(self):
+        response = self._get(body_app, 'deflate, gzip;q=0')
+        self.assertIsNone(response.content_encoding)
+        self.assertEqual(BODY, response.body)
+
+    def test_small_body(self):
+        response = self._get(small_body_app, 'gzip')
+        self.assertIsNone(response.content_encoding)
+        self.assertEqual('<Small/>', response.body)
+
+    def _use_brotli(self, module):
+        self.useFixture(fixtures.MonkeyPatch(
+            'heat.api.middleware.compression.brotli', module))
+
+    def test_brotli_preferred(self):
+        self._use_brotli(FakeBrotli)
+        response = self._get(body_app, 'gzip, br')
+        self.assertEqual('br', response.content_encoding)
+        self.assertEqual('br:4:' + BODY, response.body)
+
+    def test_brotli_streaming(self):
+        self._use_brotli(FakeBrotli)
+        response = self._get(streaming_app, 'br')
+        self.assertEqual('br', response.content_encoding)
+        self.assertEqual('br:4:' + BODY, ''.join(response.app_iter))
+
+    def test_brotlipy(self):
+        self._use_brotli(FakeBrotlipy)
+        response = self._get(body_app, 'br')
+        self.assertEqual('br', response.content_encoding)
+        self.assertEqual('br:4:' + BODY, response.body)
+
+    def test_brotli_not_accepted(self):
+        self._use_brotli(FakeBrotli)
+        response = self._get(body_app, 'gzip')
+        self.assertEqual('gzip', response.content_encoding)
+        self.assertEqual(BODY, self._gunzip(response.body))
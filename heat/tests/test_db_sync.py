@@ -0,0 +1,52 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from heat.db import sync
+
+from heat.tests.common import HeatTestCase
+
+
+class DbSyncTest(HeatTestCase):
+
+    def test_main(self):
+        self.m.StubOutWithMock(sync.cfg, 'CONF')
+        self.m.StubOutWithMock(sync.logging, 'setup')
+        self.m.StubOutWithMock(sync, 'sync')
+
+        # The host process's sys.argv is not parsed, and repeated calls
+        # each load the configuration and sync again
+        sync.cfg.CONF([], project='heat', prog='heat-engine')
+        sync.sync()
+        sync.cfg.CONF(['--config-file', 'heat.conf'],
+                      project='heat', prog='heat-engine')
+        sync.sync()
+        self.m.ReplayAll()
+
+        sync.main()
+        sync.main(['--config-file', 'heat.conf'])
+        self.m.VerifyAll()
+
+    def test_main_setup_logging(self):
+        self.m.StubOutWithMock(sync.cfg, 'CONF')
+        self.m.StubOutWithMock(sync.logging, 'setup')
+        self.m.StubOutWithMock(sync, 'sync')
+
+        sync.cfg.CONF(['--config-file', 'heat.conf'],
+                      project='heat', prog='heat-engine')
+        sync.logging.setup('heat')
+        sync.sync()
+        self.m.ReplayAll()
+
+        sync.main(['--config-file', 'heat.conf'], setup_logging=True)
+        self.m.VerifyAll()
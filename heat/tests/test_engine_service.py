@@ -947,6 +947,15 @@ class StackServiceTest(HeatTestCase):
         ctx2 = utils.dummy_context(tenant_id='stack_service_test_tenant2')
         self.assertEqual(None, db_api.stack_get_by_name(ctx2, self.stack.name))
 
+    @stack_context('service_get_stack_by_name_test_stack', False)
+    def test_get_stack_by_name(self):
+        s = self.eng._get_stack(self.ctx, self.stack.name)
+        self.assertEqual(self.stack.id, s.id)
+
+    def test_get_stack_by_name_nonexistent(self):
+        self.assertRaises(exception.StackNotFound,
+                          self.eng._get_stack, self.ctx, 'wibble')
+
     @stack_context('service_event_list_test_stack')
     def test_stack_event_list(self):
         self.m.StubOutWithMock(service.EngineService, '_get_stack')
@@ -94,7 +94,12 @@ class EngineRpcAPITestCase(testtools.TestCase):
                               stack_name='wordpress')
 
     def test_show_stack(self):
-        self._test_engine_api('show_stack', 'call', stack_identity='wordpress')
+        self._test_engine_api('show_stack', 'call',
+                              stack_identity=self.identity)
+
+    def test_show_stack_by_name(self):
+        self._test_engine_api('show_stack', 'call', stack_identity='wordpress',
+                              version='1.1')
 
     def test_create_stack(self):
         self._test_engine_api('create_stack', 'call', stack_name='wordpress',
@@ -140,6 +145,10 @@ class EngineRpcAPITestCase(testtools.TestCase):
         self._test_engine_api('list_events', 'call',
                               stack_identity=self.identity)
 
+    def test_list_events_by_name(self):
+        self._test_engine_api('list_events', 'call',
+                              stack_identity='wordpress', version='1.1')
+
     def test_describe_stack_resource(self):
         self._test_engine_api('describe_stack_resource', 'call',
                               stack_identity=self.identity,
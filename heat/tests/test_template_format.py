@@ -105,6 +105,19 @@ Outputs: {}
         self.assertEqual(msg, str(ex))
 
 
+class JsonMinimalTest(HeatTestCase):
+
+    def test_minimal_json(self):
+        tpl = template_format.parse('{"AWSTemplateFormatVersion": '
+                                    '"2010-09-09", "Resources": {}}')
+        self.assertEqual({u'AWSTemplateFormatVersion': u'2010-09-09',
+                          u'Resources': {}}, tpl)
+
+    def test_invalid_json(self):
+        self.assertRaises(ValueError, template_format.parse,
+                          '{"Resources": ')
+
+
 class JsonYamlResolvedCompareTest(HeatTestCase):
 
     def setUp(self):